@@ -0,0 +1,222 @@
+"""Admission control and load shedding for CPU-heavy endpoints.
+
+Every admitted request holds ``cost`` units of a shared capacity budget plus a
+slot in its endpoint's concurrency limit, so an expensive export counts for
+more than a readability check. Requests that do not fit wait in a bounded
+queue until a deadline; when the queue is full or the deadline passes they are
+rejected straight away with 503 and a Retry-After hint instead of piling onto
+already saturated workers. Optional per-API-key token buckets reject clients
+that exceed their rate with 429.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the HTTP status and Retry-After."""
+
+    def __init__(self, message, status=503, retry_after=1):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, amount, now=None):
+        """Take ``amount`` tokens; return 0 on success or seconds until they exist."""
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0
+        return (amount - self.tokens) / self.rate
+
+    def refund(self, amount):
+        """Give back tokens taken for a request that was shed anyway."""
+        self.tokens = min(self.burst, self.tokens + amount)
+
+
+class _Waiter:
+    """A queued request and the capacity it is holding back for itself."""
+
+    __slots__ = ('cost',)
+
+    def __init__(self, cost):
+        self.cost = cost
+
+
+class AdmissionController:
+    """Weighted concurrency limits with a bounded, deadline-driven wait queue.
+
+    ``endpoints`` maps an endpoint name to ``{'cost': units, 'max_concurrent': n}``.
+    Unknown endpoints cost one unit and are only bound by ``capacity``.
+    The queue is FIFO with backfill: every waiter holds back its cost for
+    itself, and a later request may only use capacity left over after the
+    waiters ahead of it. Cheap requests still run while an export waits for
+    room, but they can never starve it.
+    """
+
+    SMOOTHING = 0.2
+    MAX_BUCKETS = 10000
+
+    def __init__(self, capacity=8, endpoints=None, queue_size=16, queue_timeout=5.0,
+                 rate=0, burst=20):
+        self.capacity = capacity
+        self.endpoints = endpoints or {}
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._active = {}
+        self._waiters = deque()
+        self._service_time = {}
+        self._buckets = OrderedDict()
+        self.counters = {
+            'admitted': 0,
+            'queued': 0,
+            'rejected_queue_full': 0,
+            'rejected_deadline': 0,
+            'rejected_rate_limit': 0,
+        }
+
+    def _limits(self, endpoint):
+        limits = self.endpoints.get(endpoint, {})
+        cost = min(limits.get('cost', 1), self.capacity)
+        return cost, limits.get('max_concurrent')
+
+    def _reserved_ahead(self, waiter=None):
+        """Capacity held back by waiters queued before ``waiter`` (all if None)."""
+        reserved = 0
+        for other in self._waiters:
+            if other is waiter:
+                break
+            reserved += other.cost
+        return reserved
+
+    def _fits(self, endpoint, cost, max_concurrent, reserved):
+        if self._in_use + reserved + cost > self.capacity:
+            return False
+        return max_concurrent is None or self._active.get(endpoint, 0) < max_concurrent
+
+    def _retry_after(self, endpoint):
+        """Rough seconds until capacity frees up, from recent service times."""
+        service_time = self._service_time.get(endpoint, 1.0)
+        return service_time * (len(self._waiters) + 1) / max(self.capacity, 1)
+
+    def _take_tokens(self, api_key, cost):
+        """Charge ``api_key``'s bucket; return the tokens taken or raise 429."""
+        if not self.rate or api_key is None:
+            return 0
+        amount = min(cost, self.burst)
+        with self._cond:
+            bucket = self._buckets.get(api_key)
+            if bucket is None:
+                bucket = self._buckets[api_key] = TokenBucket(self.rate, self.burst)
+                if len(self._buckets) > self.MAX_BUCKETS:
+                    # Evict the least recently seen client
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(api_key)
+            wait = bucket.take(amount)
+            if wait:
+                self.counters['rejected_rate_limit'] += 1
+        if wait:
+            raise AdmissionRejected('Rate limit exceeded for this API key', 429, wait)
+        return amount
+
+    def _refund_tokens(self, api_key, amount):
+        with self._cond:
+            bucket = self._buckets.get(api_key)
+            if bucket is not None:
+                bucket.refund(amount)
+
+    def acquire(self, endpoint, api_key=None):
+        """Block until ``endpoint`` may run, or raise AdmissionRejected."""
+        cost, max_concurrent = self._limits(endpoint)
+        charged = self._take_tokens(api_key, cost)
+        try:
+            with self._cond:
+                self._wait_for_capacity(endpoint, cost, max_concurrent)
+                self._in_use += cost
+                self._active[endpoint] = self._active.get(endpoint, 0) + 1
+                self.counters['admitted'] += 1
+        except AdmissionRejected:
+            # Shed requests do not count against the client's rate
+            if charged:
+                self._refund_tokens(api_key, charged)
+            raise
+
+    def _wait_for_capacity(self, endpoint, cost, max_concurrent):
+        """Queue until the request fits; caller holds ``self._cond``."""
+        if self._fits(endpoint, cost, max_concurrent, self._reserved_ahead()):
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.counters['rejected_queue_full'] += 1
+            raise AdmissionRejected('Server is busy, try again later', 503,
+                                    self._retry_after(endpoint))
+        self.counters['queued'] += 1
+        waiter = _Waiter(cost)
+        self._waiters.append(waiter)
+        deadline = time.monotonic() + self.queue_timeout
+        try:
+            while not self._fits(endpoint, cost, max_concurrent, self._reserved_ahead(waiter)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters['rejected_deadline'] += 1
+                    raise AdmissionRejected('Server is busy, try again later', 503,
+                                            self._retry_after(endpoint))
+                self._cond.wait(remaining)
+        finally:
+            self._waiters.remove(waiter)
+            # The capacity this waiter held back is free for the ones behind it
+            self._cond.notify_all()
+
+    def release(self, endpoint, service_time=None):
+        """Return ``endpoint``'s capacity and wake any waiters."""
+        cost, _ = self._limits(endpoint)
+        with self._cond:
+            self._in_use -= cost
+            self._active[endpoint] -= 1
+            if service_time is not None:
+                previous = self._service_time.get(endpoint)
+                self._service_time[endpoint] = service_time if previous is None else (
+                    previous + self.SMOOTHING * (service_time - previous))
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, endpoint, api_key=None):
+        """Context manager holding an admission slot for the enclosed work."""
+        self.acquire(endpoint, api_key)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(endpoint, time.monotonic() - started)
+
+    def stats(self):
+        """Snapshot of current load and rejection counters."""
+        with self._cond:
+            return dict(
+                self.counters,
+                capacity=self.capacity,
+                in_use=self._in_use,
+                waiting=len(self._waiters),
+                active={k: v for k, v in self._active.items() if v}
+            )
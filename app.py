@@ -1,11 +1,12 @@
 from flask import Flask, request, jsonify, render_template, send_file
 from werkzeug.utils import secure_filename
-import PyPDF2
 import os
 import json
 from datetime import datetime
 import re
+import math
 from collections import Counter
+from functools import wraps
 import io
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
@@ -15,11 +16,41 @@ from reportlab.lib import colors
 import spacy
 from textblob import TextBlob
 import numpy as np
+from extraction import ExtractionPool, ExtractionError, detect_format
+from admission import AdmissionController, AdmissionRejected
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
+# Sandboxed PDF extraction limits
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get('EXTRACTION_WORKERS', 2))
+app.config['EXTRACTION_TIMEOUT'] = float(os.environ.get('EXTRACTION_TIMEOUT', 10))  # seconds per document
+app.config['EXTRACTION_MAX_PAGES'] = int(os.environ.get('EXTRACTION_MAX_PAGES', 50))
+app.config['EXTRACTION_MAX_ADDRESS_SPACE_MB'] = int(os.environ.get('EXTRACTION_MAX_ADDRESS_SPACE_MB', 512))  # virtual memory per worker
+app.config['EXTRACTION_MAX_DOCUMENTS'] = int(os.environ.get('EXTRACTION_MAX_DOCUMENTS', 100))  # per worker before restart
+app.config['EXTRACTION_ACQUIRE_TIMEOUT'] = float(os.environ.get('EXTRACTION_ACQUIRE_TIMEOUT', 2))  # seconds to wait for a free worker
+
+# Admission control for CPU-heavy endpoints. Extraction workers are the
+# bottleneck, so the budget scales with them: one export (cost 4) per worker,
+# and no endpoint may have more requests in flight than there are workers.
+# The queue holds one waiter per worker, so under overload an admitted request
+# waits about one service time and the rest are shed.
+_workers = app.config['EXTRACTION_WORKERS']
+app.config['ADMISSION_CAPACITY'] = int(os.environ.get('ADMISSION_CAPACITY', 4 * _workers))  # cost units in flight
+app.config['ADMISSION_QUEUE_SIZE'] = int(os.environ.get('ADMISSION_QUEUE_SIZE', _workers))
+app.config['ADMISSION_QUEUE_TIMEOUT'] = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 1))  # seconds
+app.config['API_KEY_RATE'] = float(os.environ.get('API_KEY_RATE', 0))  # cost units per second, 0 disables
+app.config['API_KEY_BURST'] = float(os.environ.get('API_KEY_BURST', 20))
+app.config['ENDPOINT_LIMITS'] = {
+    'export': {'cost': 4, 'max_concurrent': _workers},
+    'compare': {'cost': 3, 'max_concurrent': _workers},
+    'analyze': {'cost': 2, 'max_concurrent': _workers},
+    'salary': {'cost': 2, 'max_concurrent': _workers},
+    'career-paths': {'cost': 2, 'max_concurrent': _workers},
+    'readability': {'cost': 1, 'max_concurrent': _workers}
+}
+
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -30,20 +61,40 @@ except:
     print("Warning: spacy model not loaded. Install with: python -m spacy download en_core_web_sm")
     nlp = None
 
+extraction_pool = ExtractionPool(
+    workers=app.config['EXTRACTION_WORKERS'],
+    timeout=app.config['EXTRACTION_TIMEOUT'],
+    max_pages=app.config['EXTRACTION_MAX_PAGES'],
+    max_address_space_mb=app.config['EXTRACTION_MAX_ADDRESS_SPACE_MB'],
+    max_documents_per_worker=app.config['EXTRACTION_MAX_DOCUMENTS'],
+    acquire_timeout=app.config['EXTRACTION_ACQUIRE_TIMEOUT']
+)
+
+admission = AdmissionController(
+    capacity=app.config['ADMISSION_CAPACITY'],
+    endpoints=app.config['ENDPOINT_LIMITS'],
+    queue_size=app.config['ADMISSION_QUEUE_SIZE'],
+    queue_timeout=app.config['ADMISSION_QUEUE_TIMEOUT'],
+    rate=app.config['API_KEY_RATE'],
+    burst=app.config['API_KEY_BURST']
+)
+
 # ==================== UTILITY FUNCTIONS ====================
 
 def extract_text_from_pdf(file_path):
-    """Extract text from PDF file."""
-    text = ""
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-    except Exception as e:
-        print(f"Error extracting PDF: {e}")
-    return text
+    """Extract text from PDF file in a sandboxed worker.
+
+    Raises ExtractionError if the document hits a time, page or memory limit.
+    """
+    return extraction_pool.extract(os.path.abspath(file_path), 'pdf')
+
+def extract_text_from_docx(file_path):
+    """Extract text from DOCX file in a sandboxed worker."""
+    return extraction_pool.extract(os.path.abspath(file_path), 'docx')
+
+def extract_text_from_html(file_path):
+    """Extract visible text from HTML file in a sandboxed worker."""
+    return extraction_pool.extract(os.path.abspath(file_path), 'html')
 
 def extract_text_from_txt(file_path):
     """Extract text from TXT file."""
@@ -54,6 +105,52 @@ def extract_text_from_txt(file_path):
         print(f"Error reading text file: {e}")
         return ""
 
+def extract_text(file_path):
+    """Extract text from a supported resume file, or return None if unsupported."""
+    if file_path.lower().endswith('.txt'):
+        return extract_text_from_txt(file_path)
+    extractors = {
+        'pdf': extract_text_from_pdf,
+        'docx': extract_text_from_docx,
+        'html': extract_text_from_html
+    }
+    extractor = extractors.get(detect_format(file_path))
+    if extractor is None:
+        return None
+    return extractor(file_path)
+
+def extraction_error_response(error):
+    """Build the JSON response for a failed sandboxed extraction."""
+    status = 503 if error.reason in ('busy', 'shutdown', 'startup') else 422
+    response = jsonify({
+        'error': str(error),
+        'reason': error.reason,
+        'status': status
+    })
+    response.status_code = status
+    if status == 503:
+        response.headers['Retry-After'] = str(max(1, math.ceil(app.config['EXTRACTION_ACQUIRE_TIMEOUT'])))
+    return response
+
+def admission_controlled(endpoint):
+    """Shed load for a view: wait for capacity or answer 429/503 with Retry-After."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                with admission.admit(endpoint, request.headers.get('X-API-Key')):
+                    return view(*args, **kwargs)
+            except AdmissionRejected as e:
+                response = jsonify({
+                    'error': str(e),
+                    'status': e.status
+                })
+                response.status_code = e.status
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response
+        return wrapper
+    return decorator
+
 def extract_contact_info(text):
     """Extract contact information from resume text."""
     contact = {
@@ -395,6 +492,7 @@ def home():
     })
 
 @app.route('/api/analyze', methods=['POST'])
+@admission_controlled('analyze')
 def analyze():
     """Analyze a single resume."""
     if 'file' not in request.files:
@@ -411,12 +509,9 @@ def analyze():
     
     try:
         # Extract text based on file type
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(filepath)
-        elif filename.endswith('.txt'):
-            text = extract_text_from_txt(filepath)
-        else:
-            return jsonify({'error': 'Unsupported file format. Use PDF or TXT'}), 400
+        text = extract_text(filepath)
+        if text is None:
+            return jsonify({'error': 'Unsupported file format. Use PDF, DOCX, HTML or TXT'}), 400
         
         if not text:
             return jsonify({'error': 'Could not extract text from file'}), 400
@@ -429,6 +524,9 @@ def analyze():
             'analysis': analysis
         }), 200
     
+    except ExtractionError as e:
+        return extraction_error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
@@ -437,6 +535,7 @@ def analyze():
             os.remove(filepath)
 
 @app.route('/api/compare', methods=['POST'])
+@admission_controlled('compare')
 def compare():
     """Compare two resumes."""
     if 'file1' not in request.files or 'file2' not in request.files:
@@ -454,11 +553,8 @@ def compare():
         filepath1 = os.path.join(app.config['UPLOAD_FOLDER'], filename1)
         file1.save(filepath1)
         
-        if filename1.endswith('.pdf'):
-            text1 = extract_text_from_pdf(filepath1)
-        elif filename1.endswith('.txt'):
-            text1 = extract_text_from_txt(filepath1)
-        else:
+        text1 = extract_text(filepath1)
+        if text1 is None:
             return jsonify({'error': 'Unsupported format for file1'}), 400
         
         # Process second file
@@ -466,11 +562,8 @@ def compare():
         filepath2 = os.path.join(app.config['UPLOAD_FOLDER'], filename2)
         file2.save(filepath2)
         
-        if filename2.endswith('.pdf'):
-            text2 = extract_text_from_pdf(filepath2)
-        elif filename2.endswith('.txt'):
-            text2 = extract_text_from_txt(filepath2)
-        else:
+        text2 = extract_text(filepath2)
+        if text2 is None:
             return jsonify({'error': 'Unsupported format for file2'}), 400
         
         comparison = compare_resumes(text1, text2)
@@ -482,6 +575,9 @@ def compare():
             'comparison': comparison
         }), 200
     
+    except ExtractionError as e:
+        return extraction_error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
@@ -491,6 +587,7 @@ def compare():
                 os.remove(filepath)
 
 @app.route('/api/salary', methods=['POST'])
+@admission_controlled('salary')
 def salary():
     """Estimate salary based on resume."""
     if 'file' not in request.files:
@@ -505,11 +602,8 @@ def salary():
     file.save(filepath)
     
     try:
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(filepath)
-        elif filename.endswith('.txt'):
-            text = extract_text_from_txt(filepath)
-        else:
+        text = extract_text(filepath)
+        if text is None:
             return jsonify({'error': 'Unsupported file format'}), 400
         
         analysis = analyze_resume(text)
@@ -523,6 +617,9 @@ def salary():
             'basis': 'annual'
         }), 200
     
+    except ExtractionError as e:
+        return extraction_error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
@@ -531,6 +628,7 @@ def salary():
             os.remove(filepath)
 
 @app.route('/api/career-paths', methods=['POST'])
+@admission_controlled('career-paths')
 def career_paths():
     """Suggest career paths based on resume."""
     if 'file' not in request.files:
@@ -545,11 +643,8 @@ def career_paths():
     file.save(filepath)
     
     try:
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(filepath)
-        elif filename.endswith('.txt'):
-            text = extract_text_from_txt(filepath)
-        else:
+        text = extract_text(filepath)
+        if text is None:
             return jsonify({'error': 'Unsupported file format'}), 400
         
         analysis = analyze_resume(text)
@@ -562,6 +657,9 @@ def career_paths():
             'career_path_suggestions': suggestions
         }), 200
     
+    except ExtractionError as e:
+        return extraction_error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
@@ -570,6 +668,7 @@ def career_paths():
             os.remove(filepath)
 
 @app.route('/api/readability', methods=['POST'])
+@admission_controlled('readability')
 def readability():
     """Analyze resume readability."""
     if 'file' not in request.files:
@@ -584,11 +683,8 @@ def readability():
     file.save(filepath)
     
     try:
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(filepath)
-        elif filename.endswith('.txt'):
-            text = extract_text_from_txt(filepath)
-        else:
+        text = extract_text(filepath)
+        if text is None:
             return jsonify({'error': 'Unsupported file format'}), 400
         
         readability_score = calculate_readability(text)
@@ -608,6 +704,9 @@ def readability():
             'recommendations': recommendations
         }), 200
     
+    except ExtractionError as e:
+        return extraction_error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
@@ -616,6 +715,7 @@ def readability():
             os.remove(filepath)
 
 @app.route('/api/export', methods=['POST'])
+@admission_controlled('export')
 def export_analysis():
     """Export resume analysis as PDF report."""
     if 'file' not in request.files:
@@ -630,11 +730,8 @@ def export_analysis():
     file.save(filepath)
     
     try:
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(filepath)
-        elif filename.endswith('.txt'):
-            text = extract_text_from_txt(filepath)
-        else:
+        text = extract_text(filepath)
+        if text is None:
             return jsonify({'error': 'Unsupported file format'}), 400
         
         analysis = analyze_resume(text)
@@ -706,6 +803,9 @@ def export_analysis():
             download_name='resume_analysis_report.pdf'
         )
     
+    except ExtractionError as e:
+        return extraction_error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
@@ -719,7 +819,9 @@ def health():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'version': '2.0'
+        'version': '2.0',
+        'extraction': extraction_pool.stats(),
+        'admission': admission.stats()
     }), 200
 
 @app.errorhandler(404)
@@ -0,0 +1,833 @@
+"""Sandboxed text extraction.
+
+Document parsing runs in a small pool of recyclable subprocess workers so that
+a malformed or adversarial upload cannot pin a request worker's CPU or memory.
+Each document is bounded by a wall-clock timeout, a page cap and a virtual
+address-space limit (RLIMIT_AS); workers are replaced after a fixed number of
+documents or whenever one of them has to be killed. Workers import only this
+module, so the limits budget the parser rather than the web app.
+
+Text is pulled out by pluggable backends. Every format has a chain of
+backends: each one is tried first for a few documents, then the chain is
+ordered by observed cost (seconds per MB across all attempts, divided by
+success rate). A document falls back to the next backend when one fails,
+returns no text or runs out of its time slice. Run ``python extraction.py benchmark <corpus_dir>`` to compare backends.
+"""
+
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import statistics
+import subprocess
+import socket
+import sys
+import threading
+import time
+import zipfile
+from html.parser import HTMLParser
+from multiprocessing.connection import Connection
+from xml.etree import ElementTree
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, timeouts still apply
+    resource = None
+
+
+# File extension -> document format handled by the backends
+FORMATS = {
+    '.pdf': 'pdf',
+    '.docx': 'docx',
+    '.html': 'html',
+    '.htm': 'html',
+}
+
+MAX_UNCOMPRESSED_BYTES = 64 * 1024 * 1024  # largest DOCX part we will inflate
+READ_CHUNK_SIZE = 64 * 1024
+BACKEND_BUDGET = 0.9  # share of the document timeout given to backends
+
+
+class ExtractionError(Exception):
+    """Raised when a document could not be extracted within its limits."""
+
+    def __init__(self, message, reason='error'):
+        super().__init__(message)
+        self.reason = reason
+
+
+def detect_format(filename):
+    """Return the document format for ``filename`` or None if unsupported."""
+    return FORMATS.get(os.path.splitext(filename)[1].lower())
+
+
+def _check_page_count(page_count, max_pages):
+    if max_pages and page_count > max_pages:
+        raise ExtractionError(
+            f'Document has {page_count} pages, limit is {max_pages}', 'pages')
+
+
+# ==================== BACKENDS ====================
+
+class Backend:
+    """A text extractor for one or more document formats.
+
+    ``extract`` runs inside a worker process and must raise ExtractionError
+    for limit violations. A ``timeout`` means this backend ran out of its
+    time slice, so the next backend is tried; other limits belong to the
+    document and end the chain. Any other exception also falls back to the
+    next backend.
+    """
+
+    name = None
+    formats = ()
+    priority = 100  # order tried before any timings have been observed
+
+    def is_available(self):
+        return True
+
+    def warm_up(self):
+        """Import heavy dependencies ahead of the first document."""
+
+    def extract(self, file_path, max_pages, timeout):
+        raise NotImplementedError
+
+
+class PyPDFBackend(Backend):
+    """pypdf, or the legacy PyPDF2 package when pypdf is not installed."""
+
+    name = 'pypdf'
+    formats = ('pdf',)
+    priority = 20
+
+    def _module(self):
+        for module_name in ('pypdf', 'PyPDF2'):
+            if importlib.util.find_spec(module_name):
+                return module_name
+        return None
+
+    def is_available(self):
+        return self._module() is not None
+
+    def warm_up(self):
+        importlib.import_module(self._module())
+
+    def extract(self, file_path, max_pages, timeout):
+        pdf_module = __import__(self._module())
+        with open(file_path, 'rb') as file:
+            pdf_reader = pdf_module.PdfReader(file)
+            _check_page_count(len(pdf_reader.pages), max_pages)
+            return ''.join((page.extract_text() or '') + '\n' for page in pdf_reader.pages)
+
+
+class PDFMinerBackend(Backend):
+    """pdfminer.six layout analysis; slower, but handles odd encodings well."""
+
+    name = 'pdfminer'
+    formats = ('pdf',)
+    priority = 30
+
+    def is_available(self):
+        return importlib.util.find_spec('pdfminer') is not None
+
+    def warm_up(self):
+        importlib.import_module('pdfminer.high_level')
+
+    def extract(self, file_path, max_pages, timeout):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        parts = []
+        page_count = 0
+        # Ask for one page past the cap so oversized documents are detected
+        for page in extract_pages(file_path, maxpages=max_pages + 1 if max_pages else 0):
+            page_count += 1
+            _check_page_count(page_count, max_pages)
+            parts.extend(element.get_text() for element in page
+                         if isinstance(element, LTTextContainer))
+            parts.append('\n')
+        return ''.join(parts)
+
+
+class PdftotextBackend(Backend):
+    """The poppler ``pdftotext`` binary, when one is on PATH."""
+
+    name = 'pdftotext'
+    formats = ('pdf',)
+    priority = 10
+
+    def is_available(self):
+        return shutil.which('pdftotext') is not None
+
+    def extract(self, file_path, max_pages, timeout):
+        command = ['pdftotext', '-q', '-enc', 'UTF-8']
+        if max_pages:
+            command += ['-l', str(max_pages + 1)]
+        command += [file_path, '-']
+        try:
+            result = subprocess.run(command, capture_output=True, timeout=timeout, check=True)
+        except subprocess.TimeoutExpired:
+            raise ExtractionError(f'pdftotext timed out after {timeout:.1f}s', 'timeout')
+        text = result.stdout.decode('utf-8', errors='replace')
+        # pdftotext terminates every page with a form feed
+        _check_page_count(text.count('\f'), max_pages)
+        return text.replace('\f', '\n')
+
+
+class DocxBackend(Backend):
+    """Streams ``word/document.xml`` out of the DOCX archive."""
+
+    name = 'docx'
+    formats = ('docx',)
+    priority = 10
+
+    _W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+    def extract(self, file_path, max_pages, timeout):
+        with zipfile.ZipFile(file_path) as archive:
+            info = archive.getinfo('word/document.xml')
+            if info.file_size > MAX_UNCOMPRESSED_BYTES:
+                raise ExtractionError('Document is too large once decompressed', 'size')
+            parts = []
+            open_elements = []
+            with archive.open(info) as xml_file:
+                for event, element in ElementTree.iterparse(xml_file, events=('start', 'end')):
+                    if event == 'start':
+                        open_elements.append(element)
+                        continue
+                    open_elements.pop()
+                    tag = element.tag
+                    if tag == self._W + 't':
+                        parts.append(element.text or '')
+                    elif tag == self._W + 'tab':
+                        parts.append('\t')
+                    elif tag in (self._W + 'br', self._W + 'cr'):
+                        parts.append('\n')
+                    elif tag == self._W + 'p':
+                        parts.append('\n')
+                        # Paragraph text has been collected; drop the subtree
+                        element.clear()
+                    if 0 < len(open_elements) <= 2:
+                        # Finished children of w:document / w:body (paragraphs,
+                        # tables) are detached so the tree never grows with the file
+                        open_elements[-1].remove(element)
+        return ''.join(parts)
+
+
+class _HTMLTextParser(HTMLParser):
+    """Collects visible text, breaking lines at block-level elements."""
+
+    SKIP_TAGS = {'script', 'style', 'head', 'template', 'noscript'}
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                  'section', 'article', 'header', 'footer', 'table', 'ul', 'ol'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+class HTMLBackend(Backend):
+    """Feeds the HTML file to the stdlib parser in chunks."""
+
+    name = 'html'
+    formats = ('html',)
+    priority = 10
+
+    def extract(self, file_path, max_pages, timeout):
+        parser = _HTMLTextParser()
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            while True:
+                chunk = file.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+        parser.close()
+        return ''.join(parser.parts)
+
+
+BACKENDS = {backend.name: backend for backend in (
+    PdftotextBackend(),
+    PyPDFBackend(),
+    PDFMinerBackend(),
+    DocxBackend(),
+    HTMLBackend(),
+)}
+
+
+def available_backends(fmt):
+    """Names of installed backends for ``fmt`` in default priority order."""
+    backends = [b for b in BACKENDS.values() if fmt in b.formats and b.is_available()]
+    return [b.name for b in sorted(backends, key=lambda b: b.priority)]
+
+
+# ==================== WORKER PROCESS ====================
+
+def _set_address_space_limit(max_address_space_mb):
+    """Cap the worker's virtual address space so runaway parsing raises MemoryError."""
+    if resource is None or not max_address_space_mb:
+        return
+    limit = int(max_address_space_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _run_backends(file_path, backend_names, max_pages, timeout, notify=None):
+    """Try each backend in turn, returning the first non-empty text.
+
+    Every backend gets an equal slice of what is left of the time budget,
+    which ends before the parent's own deadline so subprocess backends can
+    clean up after themselves. A backend that runs out of its slice counts as
+    a failed attempt and the next one is tried. Page, size and memory limits
+    end the chain: they are properties of the document, so another backend
+    would hit them too. ``notify`` is called with each backend's name and
+    the attempts so far before the backend starts.
+    """
+    deadline = time.monotonic() + timeout * BACKEND_BUDGET
+    attempts = []
+    timeouts = 0
+    for index, name in enumerate(backend_names):
+        if notify is not None:
+            notify(name, attempts)
+        time_slice = max(0.1, (deadline - time.monotonic()) / (len(backend_names) - index))
+        started = time.perf_counter()
+        try:
+            text = BACKENDS[name].extract(file_path, max_pages, time_slice)
+        except ExtractionError as e:
+            if e.reason != 'timeout':
+                return ('limit', e.reason, str(e), attempts)
+            attempts.append((name, time.perf_counter() - started, False))
+            last_error = f'{name}: {e}'
+            timeouts += 1
+            continue
+        except MemoryError:
+            return ('limit', 'memory', 'Document exceeded the memory limit', attempts)
+        except Exception as e:
+            attempts.append((name, time.perf_counter() - started, False))
+            last_error = f'{name}: {e}'
+            continue
+        if text.strip():
+            attempts.append((name, time.perf_counter() - started, True))
+            return ('ok', text, name, attempts)
+        attempts.append((name, time.perf_counter() - started, False))
+        last_error = f'{name}: no text found'
+    if not backend_names:
+        return ('error', 'unsupported', 'No extraction backend available for this format', attempts)
+    if timeouts == len(backend_names):
+        return ('limit', 'timeout', f'Extraction timed out after {timeout:g}s', attempts)
+    return ('error', 'error', f'Could not parse document ({last_error})', attempts)
+
+
+def _worker_main(conn, max_address_space_mb, preload=()):
+    """Serve extraction jobs from the parent until told to stop.
+
+    Backend libraries and ``preload`` modules (which may register extra
+    backends) are imported before the worker reports ready, so their import
+    time is never charged to a document's timeout.
+    """
+    for module_name in preload:
+        importlib.import_module(module_name)
+    for backend in BACKENDS.values():
+        if backend.is_available():
+            backend.warm_up()
+    _set_address_space_limit(max_address_space_mb)
+    try:
+        conn.send(('ready',))
+        while True:
+            job = conn.recv()
+            if job is None:
+                return
+            conn.send(_handle_job(job, lambda name, attempts: conn.send(('started', name, attempts))))
+    except (EOFError, OSError, KeyboardInterrupt):
+        # The parent closed the connection or went away; nothing left to serve
+        return
+
+
+def _handle_job(job, notify=None):
+    """Run one extraction job and turn failures into a result message."""
+    try:
+        return _run_backends(*job, notify=notify)
+    except ExtractionError as e:
+        return ('limit', e.reason, str(e), [])
+    except MemoryError:
+        return ('limit', 'memory', 'Document exceeded the memory limit', [])
+    except Exception as e:
+        return ('error', 'error', f'Could not parse document: {e}', [])
+
+
+def _worker_entry(argv=None):
+    """Command-line entry point of a POSIX worker subprocess (see _Worker)."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fd', type=int, required=True)
+    parser.add_argument('--max-address-space-mb', type=int, default=0)
+    parser.add_argument('--preload', action='append', default=[])
+    args = parser.parse_args(argv)
+    _worker_main(Connection(args.fd), args.max_address_space_mb, args.preload)
+
+
+# ==================== WORKER POOL ====================
+
+class _Worker:
+    """A single extraction subprocess and the connection used to talk to it.
+
+    On POSIX the worker is a fresh interpreter that imports only this module,
+    so the web app (spaCy, ReportLab, ...) is never loaded into it. Elsewhere
+    it falls back to a multiprocessing ``spawn`` process, which re-imports the
+    main module.
+    """
+
+    def __init__(self, max_address_space_mb, preload, startup_timeout):
+        if os.name == 'posix':
+            parent_sock, child_sock = socket.socketpair()
+            self.conn = Connection(parent_sock.detach())
+            command = [
+                sys.executable, '-c', 'import extraction; extraction._worker_entry()',
+                '--fd', str(child_sock.fileno()),
+                '--max-address-space-mb', str(max_address_space_mb or 0)
+            ]
+            for module_name in preload:
+                command += ['--preload', module_name]
+            module_dir = os.path.dirname(os.path.abspath(__file__))
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join([module_dir] + [p for p in sys.path if p]))
+            try:
+                self.process = subprocess.Popen(command, pass_fds=(child_sock.fileno(),), env=env,
+                                                start_new_session=True)
+            finally:
+                child_sock.close()
+        else:
+            ctx = multiprocessing.get_context('spawn')
+            self.conn, child_conn = ctx.Pipe()
+            self.process = ctx.Process(target=_worker_main, daemon=True,
+                                       args=(child_conn, max_address_space_mb, tuple(preload)))
+            self.process.start()
+            child_conn.close()
+        self.documents = 0
+
+        try:
+            ready = self.conn.poll(startup_timeout) and self.conn.recv() == ('ready',)
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill()
+            raise ExtractionError('Extraction worker failed to start', 'startup')
+
+    def _wait(self, timeout=None):
+        """Wait for the process to exit; return True if it has."""
+        if isinstance(self.process, subprocess.Popen):
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                return False
+            return True
+        self.process.join(timeout)
+        return not self.process.is_alive()
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        if not self._wait(timeout=1):
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        """Terminate the worker immediately, along with any children it started."""
+        if isinstance(self.process, subprocess.Popen):
+            # The worker leads its own session, so this also reaps pdftotext & co.
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process.kill()
+        self._wait()
+        self.conn.close()
+
+
+class _BackendStats:
+    """Running cost estimate for one backend, used to order fallback chains."""
+
+    SMOOTHING = 0.2
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.seconds_per_mb = None
+
+    def record(self, seconds, size_bytes, succeeded):
+        """Fold in one attempt; failed attempts count towards the cost too."""
+        self.attempts += 1
+        if succeeded:
+            self.successes += 1
+        cost = seconds / max(size_bytes / (1024 * 1024), 0.001)
+        if self.seconds_per_mb is None:
+            self.seconds_per_mb = cost
+        else:
+            self.seconds_per_mb += self.SMOOTHING * (cost - self.seconds_per_mb)
+
+    def expected_cost(self):
+        """Expected seconds per MB spent to get one successful extraction."""
+        if not self.successes:
+            return float('inf')
+        return self.seconds_per_mb * self.attempts / self.successes
+
+    def as_dict(self):
+        return {
+            'attempts': self.attempts,
+            'successes': self.successes,
+            'seconds_per_mb': round(self.seconds_per_mb, 4) if self.seconds_per_mb is not None else None
+        }
+
+
+class ExtractionPool:
+    """Pool of subprocess workers that extract text under hard limits.
+
+    ``preload`` names extra modules imported here and in each worker at
+    startup, e.g. to register additional backends in ``BACKENDS``.
+    """
+
+    EXPLORATION_ATTEMPTS = 3
+
+    def __init__(self, workers=2, timeout=10.0, max_pages=50, max_address_space_mb=512,
+                 max_documents_per_worker=100, acquire_timeout=30.0, startup_timeout=30.0,
+                 preload=()):
+        self.size = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_address_space_mb = max_address_space_mb
+        self.max_documents_per_worker = max_documents_per_worker
+        self.acquire_timeout = acquire_timeout
+        self.startup_timeout = startup_timeout
+        self.preload = tuple(preload)
+        for module_name in self.preload:
+            importlib.import_module(module_name)
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        formats = {fmt for backend in BACKENDS.values() for fmt in backend.formats}
+        self._available = {fmt: available_backends(fmt) for fmt in formats}
+        self._backend_stats = {name: _BackendStats() for name in BACKENDS}
+        self.counters = {
+            'documents': 0,
+            'timeouts': 0,
+            'page_limit': 0,
+            'memory_limit': 0,
+            'size_limit': 0,
+            'crashes': 0,
+            'errors': 0,
+            'recycled': 0,
+            'startup_failures': 0,
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def backend_order(self, fmt):
+        """Backends for ``fmt``, cheapest first.
+
+        Each backend goes first, in default priority order, until it has
+        had ``EXPLORATION_ATTEMPTS`` attempts, so every installed backend
+        gets measured. After that, backends are ranked by expected cost;
+        backends that never succeed drop to the end of the chain.
+        """
+        def sort_key(name):
+            stats = self._backend_stats[name]
+            if stats.attempts < self.EXPLORATION_ATTEMPTS:
+                return (0, BACKENDS[name].priority)
+            return (1, stats.expected_cost(), BACKENDS[name].priority)
+
+        with self._lock:
+            return sorted(self._available.get(fmt, []), key=sort_key)
+
+    def _record_backends(self, attempts, size_bytes):
+        with self._lock:
+            for name, seconds, succeeded in attempts:
+                self._backend_stats[name].record(seconds, size_bytes, succeeded)
+
+    def _wait_for_result(self, worker, backend_names, size_bytes):
+        """Receive the job's result, killing the worker if it overruns the timeout.
+
+        The worker announces each backend, with the attempts finished so far,
+        as it starts it. When the worker has to be killed, those attempts are
+        still recorded and the backend it was stuck in is charged a failed
+        one, so the chain reorders around it.
+        """
+        deadline = time.monotonic() + self.timeout
+        running = backend_names[0] if backend_names else None
+        attempts = []
+        started = time.perf_counter()
+        while worker.conn.poll(max(0.0, deadline - time.monotonic())):
+            message = worker.conn.recv()
+            if message[0] != 'started':
+                return message
+            _, running, attempts = message
+            started = time.perf_counter()
+        self._count('timeouts')
+        if running is not None:
+            attempts = attempts + [(running, time.perf_counter() - started, False)]
+        self._record_backends(attempts, size_bytes)
+        raise ExtractionError(f'Extraction timed out after {self.timeout:g}s', 'timeout')
+
+    def _acquire(self):
+        """Return an idle worker, starting a new one while under the pool size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise ExtractionError('Extraction pool is shut down', 'shutdown')
+            if self._started < self.size:
+                self._started += 1
+                spawn = True
+            else:
+                spawn = False
+        if spawn:
+            return self._start_worker()
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise ExtractionError('All extraction workers are busy', 'busy')
+
+    def _start_worker(self):
+        """Start a worker for a slot already counted in ``_started``."""
+        try:
+            return _Worker(self.max_address_space_mb, self.preload, self.startup_timeout)
+        except Exception:
+            self._count('startup_failures')
+            self._discard()
+            raise
+
+    def _replenish(self):
+        """Start a replacement worker in the background so no request waits for it."""
+        with self._lock:
+            if self._closed or self._started >= self.size:
+                return
+            self._started += 1
+
+        def start():
+            try:
+                worker = self._start_worker()
+            except Exception:
+                return
+            self._idle.put(worker)
+            if self._closed:
+                self.shutdown()
+
+        threading.Thread(target=start, daemon=True).start()
+
+    def _release(self, worker):
+        """Return a healthy worker to the pool, recycling it when it is worn out."""
+        if self._closed or worker.documents >= self.max_documents_per_worker:
+            if not self._closed:
+                self._count('recycled')
+            # Stopping can take a moment; keep it off the request thread.
+            threading.Thread(target=worker.stop, daemon=True).start()
+            self._discard()
+            self._replenish()
+            return
+        self._idle.put(worker)
+
+    def _kill(self, worker):
+        """Kill a misbehaving worker and start its replacement."""
+        worker.kill()
+        self._discard()
+        self._replenish()
+
+    def _discard(self):
+        with self._lock:
+            self._started -= 1
+
+    def extract(self, file_path, fmt='pdf', backends=None):
+        """Extract text from ``file_path`` in a sandboxed worker.
+
+        ``backends`` overrides the automatic backend order. Raises
+        ExtractionError when the document breaks a limit or cannot be parsed
+        by any backend; the offending worker is killed and replaced in the
+        background. The timeout only starts once a ready worker has the job.
+        """
+        backend_names = list(backends) if backends is not None else self.backend_order(fmt)
+        unknown = [name for name in backend_names if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown extraction backend(s): {', '.join(unknown)}")
+        size_bytes = os.path.getsize(file_path)
+        worker = self._acquire()
+        try:
+            worker.conn.send((file_path, backend_names, self.max_pages, self.timeout))
+            result = self._wait_for_result(worker, backend_names, size_bytes)
+        except ExtractionError:
+            self._kill(worker)
+            raise
+        except (EOFError, OSError):
+            self._count('crashes')
+            self._kill(worker)
+            raise ExtractionError('Extraction worker crashed', 'crash')
+
+        worker.documents += 1
+        self._count('documents')
+        self._record_backends(result[-1], size_bytes)
+        if result[0] == 'limit' and result[1] == 'memory':
+            # The worker's heap is likely fragmented or exhausted; replace it.
+            self._count('memory_limit')
+            self._kill(worker)
+        else:
+            self._release(worker)
+
+        if result[0] == 'ok':
+            return result[1]
+        if result[1] == 'pages':
+            self._count('page_limit')
+        elif result[1] == 'size':
+            self._count('size_limit')
+        elif result[1] == 'timeout':
+            self._count('timeouts')
+        elif result[0] == 'error':
+            self._count('errors')
+        raise ExtractionError(result[2], result[1])
+
+    def stats(self):
+        """Snapshot of pool counters and per-backend cost estimates."""
+        with self._lock:
+            return dict(
+                self.counters,
+                workers=self._started,
+                backends={name: self._backend_stats[name].as_dict()
+                          for names in self._available.values() for name in names}
+            )
+
+    def shutdown(self):
+        """Stop all idle workers; busy workers are stopped when released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+            self._discard()
+
+
+# ==================== BENCHMARK ====================
+
+def _word_set(text):
+    return set(text.lower().split())
+
+
+def _jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def benchmark(corpus_dir, repeat=1, max_pages=0):
+    """Time every installed backend on every supported file in ``corpus_dir``.
+
+    Output quality is estimated without ground truth: ``agreement`` is the
+    mean word-set Jaccard similarity with the other backends' output for the
+    same document, and ``clean`` is the share of printable characters.
+    """
+    files = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(corpus_dir)
+        for name in names if detect_format(name)
+    )
+    results = {}
+    agreements = {}
+    for file_path in files:
+        fmt = detect_format(file_path)
+        outputs = {}
+        for name in available_backends(fmt):
+            row = results.setdefault(name, {'docs': 0, 'failed': 0, 'times': [], 'bytes': 0,
+                                            'words': 0, 'clean': []})
+            try:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    text = BACKENDS[name].extract(file_path, max_pages, None)
+                    timings.append(time.perf_counter() - started)
+            except Exception:
+                row['failed'] += 1
+                continue
+            row['docs'] += 1
+            row['times'].append(min(timings))
+            row['bytes'] += os.path.getsize(file_path)
+            row['words'] += len(text.split())
+            if text:
+                row['clean'].append(sum(c.isprintable() or c.isspace() for c in text) / len(text))
+            outputs[name] = _word_set(text)
+        for name, words in outputs.items():
+            others = [_jaccard(words, other) for other_name, other in outputs.items()
+                      if other_name != name]
+            if others:
+                agreements.setdefault(name, []).append(statistics.mean(others))
+
+    report = []
+    for name, row in results.items():
+        total = sum(row['times'])
+        report.append({
+            'backend': name,
+            'docs': row['docs'],
+            'failed': row['failed'],
+            'total_s': round(total, 3),
+            'median_ms': round(statistics.median(row['times']) * 1000, 2) if row['times'] else None,
+            'mb_per_s': round(row['bytes'] / (1024 * 1024) / total, 2) if total else None,
+            'avg_words': round(row['words'] / row['docs']) if row['docs'] else 0,
+            'clean': round(statistics.mean(row['clean']), 4) if row['clean'] else None,
+            'agreement': round(statistics.mean(agreements[name]), 4) if name in agreements else None,
+        })
+    return sorted(report, key=lambda r: (r['total_s'] if r['docs'] else float('inf')))
+
+
+def _print_report(report):
+    columns = ['backend', 'docs', 'failed', 'total_s', 'median_ms', 'mb_per_s',
+               'avg_words', 'clean', 'agreement']
+    widths = {c: max(len(c), *(len(str(r[c])) for r in report)) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    for row in report:
+        print('  '.join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Text extraction utilities')
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench = commands.add_parser('benchmark', help='Compare extraction backends on a corpus')
+    bench.add_argument('corpus_dir', help='Directory of PDF, DOCX and HTML documents')
+    bench.add_argument('--repeat', type=int, default=1, help='Runs per document (fastest is kept)')
+    bench.add_argument('--max-pages', type=int, default=0, help='Page cap (0 for none)')
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.corpus_dir, repeat=args.repeat, max_pages=args.max_pages)
+    if not report:
+        print('No supported documents or backends found', file=sys.stderr)
+        return 1
+    _print_report(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Open-loop load generator for the Resume Analyser API.
+
+Sends uploads at fixed request rates regardless of how fast the server answers,
+so it can push the app past saturation, and reports latency percentiles for
+admitted (2xx) requests separately from shed (429/503) ones. With admission
+control working, p99 for admitted requests should stay roughly flat as the
+offered rate climbs while the rejected share grows, and /api/health should
+keep answering quickly.
+
+    python app.py &
+    python loadgen.py --url http://localhost:5000/api/analyze --rates 2,5,10,20,40
+"""
+
+import argparse
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe
+
+Senior Software Engineer, Example Corp (Jan 2019 - Present)
+Built Python and Go microservices on AWS with Docker and Kubernetes.
+Led a team of five engineers delivering REST and GraphQL APIs.
+
+Software Developer, Sample Inc (Jun 2015 - Dec 2018)
+Developed React and TypeScript frontends backed by PostgreSQL and Redis.
+
+Education
+B.S. Computer Science, State University
+"""
+
+
+def build_multipart(filename, content):
+    """Encode a single ``file`` field as multipart/form-data."""
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def send(url, body, content_type, api_key, timeout):
+    """Issue one request; return (status, latency seconds)."""
+    req = urllib.request.Request(url, data=body, method='POST' if body else 'GET')
+    if body:
+        req.add_header('Content-Type', content_type)
+    if api_key:
+        req.add_header('X-API-Key', api_key)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except OSError:
+        status = 0  # connection error or client timeout
+    return status, time.perf_counter() - started
+
+
+def run_step(args, rate, filename, content, health_url):
+    """Drive ``rate`` requests per second for ``args.duration`` seconds.
+
+    Every request uploads under its own filename, as distinct users would;
+    the app saves uploads by name, so identical names would clobber each other.
+    """
+    results = []
+    health = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def record(future):
+        with lock:
+            results.append(future.result())
+
+    def poll_health():
+        while not stop.is_set():
+            health.append(send(health_url, None, None, None, args.timeout))
+            stop.wait(0.25)
+
+    health_thread = threading.Thread(target=poll_health, daemon=True)
+    health_thread.start()
+    with ThreadPoolExecutor(max_workers=args.max_in_flight) as executor:
+        interval = 1.0 / rate
+        started = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - started < args.duration:
+            body, content_type = build_multipart(f'{uuid.uuid4().hex[:8]}-{filename}', content)
+            future = executor.submit(send, args.url, body, content_type, args.api_key, args.timeout)
+            future.add_done_callback(record)
+            sent += 1
+            # Schedule against the start time so slow responses never lower the offered rate
+            time.sleep(max(0.0, started + sent * interval - time.perf_counter()))
+    stop.set()
+    health_thread.join()
+
+    admitted = [latency for status, latency in results if 200 <= status < 300]
+    rejected = [latency for status, latency in results if status in (429, 503)]
+
+    def ms(value):
+        return f'{value * 1000:.0f}' if value is not None else '-'
+
+    return {
+        'rate': rate,
+        'sent': sent,
+        'ok': len(admitted),
+        '429': sum(1 for status, _ in results if status == 429),
+        '503': sum(1 for status, _ in results if status == 503),
+        'other': sum(1 for status, _ in results if not (200 <= status < 300 or status in (429, 503))),
+        'p50_ok_ms': ms(percentile(admitted, 50)),
+        'p99_ok_ms': ms(percentile(admitted, 99)),
+        'p99_shed_ms': ms(percentile(rejected, 99)),
+        'p99_health_ms': ms(percentile([latency for _, latency in health], 99)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Open-loop load generator for the Resume Analyser API')
+    parser.add_argument('--url', default='http://localhost:5000/api/analyze', help='Endpoint to load')
+    parser.add_argument('--file', help='Resume to upload (defaults to a built-in text resume)')
+    parser.add_argument('--rates', default='2,5,10,20,40', help='Comma-separated requests per second')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per rate step')
+    parser.add_argument('--timeout', type=float, default=30, help='Client timeout in seconds')
+    parser.add_argument('--max-in-flight', type=int, default=256, help='Client-side concurrency cap')
+    parser.add_argument('--api-key', help='Value for the X-API-Key header')
+    args = parser.parse_args(argv)
+
+    if args.file:
+        with open(args.file, 'rb') as file:
+            filename, content = os.path.basename(args.file), file.read()
+    else:
+        filename, content = 'resume.txt', SAMPLE_RESUME.encode()
+    health_url = urllib.parse.urljoin(args.url, '/api/health')
+
+    columns = ['rate', 'sent', 'ok', '429', '503', 'other',
+               'p50_ok_ms', 'p99_ok_ms', 'p99_shed_ms', 'p99_health_ms']
+    print('  '.join(f'{c:>13}' for c in columns))
+    for rate in (float(r) for r in args.rates.split(',')):
+        row = run_step(args, rate, filename, content, health_url)
+        print('  '.join(f'{row[c]:>13}' for c in columns), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+"""Compact columnar storage for analysis results.
+
+``analyze_resume`` returns a nested dict of lists and strings, which costs
+several KB per resume once held in memory. ResultTable keeps the same data
+column by column: skills and education are interned integer ids in CSR
+(offsets + ids) layout, readability metrics and counts are typed NumPy
+columns, timestamps are int64 microseconds, and free text (contact details,
+experience lines) is packed into UTF-8 blobs. Dicts are only rebuilt at the
+API edge with ``to_dict``.
+
+Tables serialize to a flat binary format whose column buffers are 8-byte
+aligned, so ``ResultTable.from_buffer`` over bytes or an ``mmap`` wraps the
+columns with ``np.frombuffer`` instead of copying them.
+
+Run ``python results.py --count 100000`` to measure the memory saved.
+"""
+
+import argparse
+import array
+import json
+import random
+import struct
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+MAGIC = b'RSTB'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sHxxI')  # magic, version, metadata length
+_ALIGNMENT = 8
+
+CONTACT_FIELDS = ('email', 'phone', 'linkedin', 'github')
+COMPLEXITY_LEVELS = (None, 'Very Easy', 'Easy', 'Standard', 'Fairly Difficult', 'Difficult', 'Unknown')
+
+# readability_kind values: which keys calculate_readability returned
+_READABILITY_EMPTY, _READABILITY_PARTIAL, _READABILITY_FULL = 0, 1, 2
+# Flag or-ed into readability_kind: grade_level was the int 0 rather than a float
+_GRADE_LEVEL_INT = 4
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Column name -> dtype, in serialization order
+COLUMNS = {
+    'length': np.int64,
+    'word_count': np.int32,
+    'timestamp_us': np.int64,
+    'grade_level': np.float32,
+    'avg_words_per_sentence': np.float32,
+    'readability_word_count': np.int32,
+    'sentence_count': np.int32,
+    'complexity': np.uint8,
+    'readability_kind': np.uint8,
+    'contact_mask': np.uint8,
+    'skill_offsets': np.int64,
+    'skill_ids': np.uint16,
+    'education_offsets': np.int64,
+    'education_ids': np.uint16,
+    'experience_offsets': np.int64,
+    'experience_lines': np.int32,
+    'experience_text_offsets': np.int64,
+    'experience_text': np.uint8,
+}
+COLUMNS.update({f'{field}_text_offsets': np.int64 for field in CONTACT_FIELDS})
+COLUMNS.update({f'{field}_text': np.uint8 for field in CONTACT_FIELDS})
+
+# array.array typecodes used while building each dtype
+_TYPECODES = {np.int64: 'q', np.int32: 'i', np.float32: 'f', np.uint16: 'H', np.uint8: 'B'}
+
+
+class Vocabulary:
+    """Interns strings to small integer ids."""
+
+    def __init__(self, words=()):
+        self.words = []
+        self._ids = {}
+        for word in words:
+            self.intern(word)
+
+    def intern(self, word):
+        word_id = self._ids.get(word)
+        if word_id is None:
+            word_id = len(self.words)
+            if word_id > np.iinfo(np.uint16).max:
+                raise ValueError('Vocabulary is limited to 65536 distinct entries')
+            self.words.append(word)
+            self._ids[word] = word_id
+        return word_id
+
+    def __len__(self):
+        return len(self.words)
+
+
+def _timestamp_to_us(timestamp):
+    return (datetime.fromisoformat(timestamp) - _EPOCH) // _MICROSECOND
+
+
+def _us_to_timestamp(value):
+    return (_EPOCH + timedelta(microseconds=int(value))).isoformat()
+
+
+class ResultTableBuilder:
+    """Accumulates analysis dicts into typed buffers; ``build`` freezes them."""
+
+    def __init__(self, skills=None, education=None):
+        self.skills = skills if skills is not None else Vocabulary()
+        self.education = education if education is not None else Vocabulary()
+        self._columns = {name: array.array(_TYPECODES[dtype]) for name, dtype in COLUMNS.items()}
+        self._text = {name: bytearray() for name in COLUMNS if name.endswith('_text')}
+        for name in COLUMNS:
+            if name.endswith('_offsets'):
+                self._columns[name].append(0)
+        self._rows = 0
+
+    def _append_text(self, name, value):
+        self._text[f'{name}_text'] += value.encode('utf-8')
+        self._columns[f'{name}_text_offsets'].append(len(self._text[f'{name}_text']))
+
+    def append(self, analysis):
+        """Add one ``analyze_resume`` result."""
+        c = self._columns
+        c['length'].append(analysis['length'])
+        c['word_count'].append(analysis['word_count'])
+        c['timestamp_us'].append(_timestamp_to_us(analysis['analysis_timestamp']))
+
+        readability = analysis['readability']
+        if not readability:
+            kind = _READABILITY_EMPTY
+        elif 'word_count' in readability:
+            kind = _READABILITY_FULL
+        else:
+            kind = _READABILITY_PARTIAL
+        grade_level = readability.get('grade_level', 0)
+        if kind != _READABILITY_EMPTY and isinstance(grade_level, int):
+            kind |= _GRADE_LEVEL_INT
+        c['readability_kind'].append(kind)
+        c['grade_level'].append(grade_level)
+        c['complexity'].append(COMPLEXITY_LEVELS.index(readability.get('complexity')))
+        c['readability_word_count'].append(readability.get('word_count', 0))
+        c['sentence_count'].append(readability.get('sentence_count', 0))
+        c['avg_words_per_sentence'].append(readability.get('avg_words_per_sentence', 0))
+
+        mask = 0
+        for bit, field in enumerate(CONTACT_FIELDS):
+            value = analysis['contact_info'].get(field)
+            if value is not None:
+                mask |= 1 << bit
+            self._append_text(field, value or '')
+        c['contact_mask'].append(mask)
+
+        c['skill_ids'].extend(self.skills.intern(skill) for skill in analysis['skills'])
+        c['skill_offsets'].append(len(c['skill_ids']))
+        c['education_ids'].extend(self.education.intern(degree) for degree in analysis['education'])
+        c['education_offsets'].append(len(c['education_ids']))
+
+        for entry in analysis['experience']:
+            c['experience_lines'].append(entry['line_number'])
+            self._append_text('experience', entry['position'])
+        c['experience_offsets'].append(len(c['experience_lines']))
+        self._rows += 1
+
+    def build(self):
+        """Return a ResultTable over the accumulated rows."""
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            if name in self._text:
+                columns[name] = np.frombuffer(bytes(self._text[name]), dtype=np.uint8)
+            else:
+                columns[name] = np.array(self._columns[name], dtype=dtype)
+        return ResultTable(columns, self._rows, list(self.skills.words), list(self.education.words))
+
+
+class ResultTable:
+    """Immutable column store of analysis results; rows become dicts on demand."""
+
+    def __init__(self, columns, rows, skills, education):
+        self.columns = columns
+        self.rows = rows
+        self.skills = skills
+        self.education = education
+
+    @classmethod
+    def from_analyses(cls, analyses, skills=None, education=None):
+        """Build a table from an iterable of ``analyze_resume`` dicts.
+
+        ``skills`` and ``education`` are optional Vocabulary objects shared
+        with other tables, so their ids stay comparable.
+        """
+        builder = ResultTableBuilder(skills=skills, education=education)
+        for analysis in analyses:
+            builder.append(analysis)
+        return builder.build()
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for index in range(self.rows):
+            yield self.to_dict(index)
+
+    def _text(self, name, index):
+        offsets = self.columns[f'{name}_text_offsets']
+        return bytes(self.columns[f'{name}_text'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+    def _ids(self, name, index):
+        offsets = self.columns[f'{name}_offsets']
+        return self.columns[f'{name}_ids'][offsets[index]:offsets[index + 1]]
+
+    def skill_ids(self, index):
+        """Interned skill ids for row ``index`` as a NumPy view."""
+        return self._ids('skill', index)
+
+    def to_dict(self, index):
+        """Rebuild the ``analyze_resume`` dict for row ``index``."""
+        if not 0 <= index < self.rows:
+            raise IndexError('result index out of range')
+        c = self.columns
+        mask = int(c['contact_mask'][index])
+        contact_info = {
+            field: self._text(field, index) if mask & (1 << bit) else None
+            for bit, field in enumerate(CONTACT_FIELDS)
+        }
+
+        kind = int(c['readability_kind'][index])
+        grade_level_is_int = kind & _GRADE_LEVEL_INT
+        kind &= ~_GRADE_LEVEL_INT
+        readability = {}
+        if kind != _READABILITY_EMPTY:
+            grade_level = float(c['grade_level'][index])
+            readability['grade_level'] = int(grade_level) if grade_level_is_int else round(grade_level, 2)
+            readability['complexity'] = COMPLEXITY_LEVELS[c['complexity'][index]]
+        if kind == _READABILITY_FULL:
+            readability['word_count'] = int(c['readability_word_count'][index])
+            readability['sentence_count'] = int(c['sentence_count'][index])
+            readability['avg_words_per_sentence'] = round(float(c['avg_words_per_sentence'][index]), 2)
+
+        start, end = c['experience_offsets'][index], c['experience_offsets'][index + 1]
+        experience = [
+            {
+                'position': self._text('experience', entry),
+                'line_number': int(c['experience_lines'][entry])
+            }
+            for entry in range(start, end)
+        ]
+
+        return {
+            'contact_info': contact_info,
+            'skills': [self.skills[i] for i in self._ids('skill', index)],
+            'experience': experience,
+            'education': [self.education[i] for i in self._ids('education', index)],
+            'readability': readability,
+            'length': int(c['length'][index]),
+            'word_count': int(c['word_count'][index]),
+            'analysis_timestamp': _us_to_timestamp(c['timestamp_us'][index])
+        }
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column buffers."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    # ---------- binary serialization ----------
+
+    def _layout(self):
+        """Metadata and the aligned (offset, column) placement of every buffer."""
+        placements = []
+        position = 0
+        for name in COLUMNS:
+            position += -position % _ALIGNMENT
+            placements.append((name, position))
+            position += self.columns[name].nbytes
+        metadata = json.dumps({
+            'rows': self.rows,
+            'skills': self.skills,
+            'education': self.education,
+            'columns': {name: [offset, int(self.columns[name].size)] for name, offset in placements}
+        }).encode('utf-8')
+        data_start = _HEADER.size + len(metadata)
+        data_start += -data_start % _ALIGNMENT
+        return metadata, data_start, placements, position
+
+    def write(self, file):
+        """Write the table to a binary file object without copying columns."""
+        metadata, data_start, placements, _ = self._layout()
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(metadata)))
+        file.write(metadata)
+        written = _HEADER.size + len(metadata)
+        for name, offset in placements:
+            file.write(b'\0' * (data_start + offset - written))
+            file.write(memoryview(np.ascontiguousarray(self.columns[name])).cast('B'))
+            written = data_start + offset + self.columns[name].nbytes
+
+    def to_bytes(self):
+        """Serialize the table into one ``bytearray``.
+
+        The columns are copied into it once; use ``write`` to stream a large
+        table to a file without holding a second copy in memory.
+        """
+        metadata, data_start, placements, data_size = self._layout()
+        buffer = bytearray(data_start + data_size)
+        _HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, len(metadata))
+        buffer[_HEADER.size:_HEADER.size + len(metadata)] = metadata
+        for name, offset in placements:
+            column = self.columns[name]
+            start = data_start + offset
+            buffer[start:start + column.nbytes] = memoryview(np.ascontiguousarray(column)).cast('B')
+        return buffer
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Wrap a serialized table; columns are read-only views into ``buffer``."""
+        view = memoryview(buffer).toreadonly()
+        magic, version, metadata_length = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('Not a serialized result table')
+        metadata = json.loads(bytes(view[_HEADER.size:_HEADER.size + metadata_length]))
+        data_start = _HEADER.size + metadata_length
+        data_start += -data_start % _ALIGNMENT
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            offset, count = metadata['columns'][name]
+            columns[name] = np.frombuffer(view, dtype=dtype, count=count, offset=data_start + offset)
+        return cls(columns, metadata['rows'], metadata['skills'], metadata['education'])
+
+
+# ==================== MEMORY MEASUREMENT ====================
+
+_SAMPLE_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'node.js', 'django', 'flask',
+    'sql', 'postgresql', 'mongodb', 'docker', 'kubernetes', 'aws', 'gcp', 'git', 'linux',
+    'machine learning', 'pandas', 'numpy', 'rest', 'graphql', 'agile', 'scrum', 'redis'
+]
+_SAMPLE_TITLES = ['Senior Software Engineer', 'Data Analyst', 'Backend Developer',
+                  'Engineering Manager', 'DevOps Engineer', 'Intern']
+
+
+def synthetic_analyses(count, seed=0):
+    """Yield dicts shaped like ``analyze_resume`` output, with distinct strings."""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    for i in range(count):
+        words = rng.randint(200, 900)
+        sentences = rng.randint(10, 60)
+        yield {
+            'contact_info': {
+                'email': f'candidate{i}@example.com',
+                'phone': f'555-{i % 1000:03d}-{i % 10000:04d}',
+                'linkedin': f'linkedin.com/in/candidate{i}' if i % 2 else None,
+                'github': None
+            },
+            'skills': rng.sample(_SAMPLE_SKILLS, rng.randint(3, 12)),
+            'experience': [
+                {'position': f'{rng.choice(_SAMPLE_TITLES)}, Company {i}-{j}', 'line_number': 4 + j * 6}
+                for j in range(rng.randint(1, 5))
+            ],
+            'education': rng.sample(['Bachelor', 'Master', 'Phd', 'Certificate'], rng.randint(0, 2)),
+            'readability': {
+                'grade_level': round(rng.uniform(6, 18), 2),
+                'complexity': rng.choice(COMPLEXITY_LEVELS[1:6]),
+                'word_count': words,
+                'sentence_count': sentences,
+                'avg_words_per_sentence': round(words / sentences, 2)
+            },
+            'length': words * 6,
+            'word_count': words,
+            'analysis_timestamp': (base + timedelta(seconds=i, microseconds=i % 997)).isoformat()
+        }
+
+
+def _traced(build):
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def measure(count=100000):
+    """Compare retained memory of ``count`` result dicts against a ResultTable."""
+    dicts, dict_bytes = _traced(lambda: list(synthetic_analyses(count)))
+    del dicts
+    # Traced the same way as the dicts: NumPy reports its buffers to tracemalloc
+    table, table_bytes = _traced(lambda: ResultTable.from_analyses(synthetic_analyses(count)))
+    serialized = len(table.to_bytes())
+    return {
+        'rows': count,
+        'dict_bytes': dict_bytes,
+        'table_bytes': table_bytes,
+        'serialized_bytes': serialized,
+        'bytes_saved_per_100k': round((dict_bytes - table_bytes) / count * 100000),
+        'reduction': round(dict_bytes / table_bytes, 1)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure columnar result storage')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic results to store')
+    args = parser.parse_args(argv)
+    report = measure(args.count)
+    mb = 1024 * 1024
+    print(f"rows:                {report['rows']:,}")
+    print(f"dicts:               {report['dict_bytes'] / mb:8.1f} MB ({report['dict_bytes'] / report['rows']:,.0f} B/row)")
+    print(f"columnar table:      {report['table_bytes'] / mb:8.1f} MB ({report['table_bytes'] / report['rows']:,.0f} B/row)")
+    print(f"serialized:          {report['serialized_bytes'] / mb:8.1f} MB")
+    print(f"saved per 100k rows: {report['bytes_saved_per_100k'] / mb:8.1f} MB ({report['reduction']}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
@@ -39,14 +39,14 @@ function validateResumeFile(event) {
     // Validate file type
     const allowedTypes = [
         'application/pdf',
-        'application/msword',
         'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'text/plain'
+        'text/plain',
+        'text/html'
     ];
 
     if (!allowedTypes.includes(file.type)) {
         showAlert(
-            'Invalid file type. Please upload a PDF, DOC, DOCX, or TXT file.',
+            'Invalid file type. Please upload a PDF, DOCX, HTML, or TXT file.',
             'error'
         );
         resumeInput.value = '';
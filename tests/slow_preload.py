@@ -0,0 +1,5 @@
+"""Simulates a worker whose imports take longer than the document timeout."""
+
+import time
+
+time.sleep(1.5)
@@ -0,0 +1,106 @@
+"""Test-only extraction backends, imported into workers via ``preload``."""
+
+import os
+import subprocess
+import time
+
+from extraction import BACKENDS, Backend, ExtractionError, _check_page_count
+
+
+class _StubBackend(Backend):
+    formats = ('stub',)
+
+
+class EchoBackend(_StubBackend):
+    name = 'stub_echo'
+
+    def extract(self, file_path, max_pages, timeout):
+        with open(file_path) as file:
+            return file.read()
+
+
+class PidBackend(_StubBackend):
+    name = 'stub_pid'
+
+    def extract(self, file_path, max_pages, timeout):
+        return str(os.getpid())
+
+
+class SlowBackend(_StubBackend):
+    name = 'stub_slow'
+
+    def extract(self, file_path, max_pages, timeout):
+        time.sleep(30)
+        return 'too late'
+
+
+class SpawnBackend(_StubBackend):
+    """Starts a child that outlives the document unless its process group is killed."""
+
+    name = 'stub_spawn'
+
+    def extract(self, file_path, max_pages, timeout):
+        child = subprocess.Popen(['sleep', '30'])
+        with open(file_path + '.pid', 'w') as file:
+            file.write(str(child.pid))
+        child.wait()
+        return 'too late'
+
+
+class PagesBackend(_StubBackend):
+    name = 'stub_pages'
+
+    def extract(self, file_path, max_pages, timeout):
+        _check_page_count(1000, max_pages)
+        return 'unreachable'
+
+
+class ExitBackend(_StubBackend):
+    name = 'stub_exit'
+
+    def extract(self, file_path, max_pages, timeout):
+        os._exit(1)
+
+
+class AllocBackend(_StubBackend):
+    name = 'stub_alloc'
+
+    def extract(self, file_path, max_pages, timeout):
+        return str(len(bytearray(2 * 1024 * 1024 * 1024)))
+
+
+class EmptyBackend(Backend):
+    """Preferred by priority for the 'ordered' format, but never finds text."""
+
+    name = 'stub_empty'
+    formats = ('ordered',)
+    priority = 1
+
+    def extract(self, file_path, max_pages, timeout):
+        return ''
+
+
+class HangingBackend(Backend):
+    """Preferred by priority for the 'hanging' format, but always runs out of time."""
+
+    name = 'stub_hanging'
+    formats = ('hanging',)
+    priority = 1
+
+    def extract(self, file_path, max_pages, timeout):
+        time.sleep(timeout)
+        raise ExtractionError(f'stub_hanging timed out after {timeout:.1f}s', 'timeout')
+
+
+class FallbackBackend(Backend):
+    name = 'stub_fallback'
+    formats = ('ordered', 'hanging')
+    priority = 50
+
+    def extract(self, file_path, max_pages, timeout):
+        return 'fallback text'
+
+
+for _backend in (EchoBackend(), PidBackend(), SlowBackend(), SpawnBackend(), PagesBackend(),
+                 ExitBackend(), AllocBackend(), EmptyBackend(), HangingBackend(), FallbackBackend()):
+    BACKENDS[_backend.name] = _backend
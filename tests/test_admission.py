@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+
+ENDPOINTS = {
+    'export': {'cost': 4},
+    'readability': {'cost': 1},
+}
+
+
+def hold(controller, endpoint, release, admitted=None):
+    """Run a request on a thread that keeps its slot until ``release`` is set."""
+    def run():
+        try:
+            with controller.admit(endpoint):
+                if admitted is not None:
+                    admitted.append(endpoint)
+                release.wait(5)
+        except AdmissionRejected:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_queued_export_is_not_starved_by_cheap_requests():
+    controller = AdmissionController(capacity=4, endpoints=ENDPOINTS, queue_size=50, queue_timeout=5)
+    releases = [threading.Event() for _ in range(4)]
+    for release in releases:
+        hold(controller, 'readability', release)
+    wait_until(lambda: controller.stats()['in_use'] == 4)
+
+    admitted = []
+    export_release = threading.Event()
+    hold(controller, 'export', export_release, admitted)
+    wait_until(lambda: controller.stats()['waiting'] == 1)
+
+    # A stream of cheap requests arrives while the running ones finish
+    for release in releases:
+        release.set()
+        hold(controller, 'readability', threading.Event(), admitted)
+    wait_until(lambda: 'export' in admitted)
+    assert admitted[0] == 'export'
+    export_release.set()
+
+
+def test_capacity_held_for_queued_export_is_not_taken():
+    controller = AdmissionController(capacity=6, endpoints=ENDPOINTS, queue_timeout=1)
+    release = threading.Event()
+    hold(controller, 'export', release)
+    hold(controller, 'readability', release)
+    wait_until(lambda: controller.stats()['in_use'] == 5)
+    hold(controller, 'export', release)
+    wait_until(lambda: controller.stats()['waiting'] == 1)
+
+    # One unit is free, but the export ahead in the queue is holding back four
+    controller.queue_timeout = 0.05
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire('readability')
+    assert excinfo.value.status == 503
+    assert controller.stats()['rejected_deadline'] == 1
+    release.set()
+
+
+def test_cheap_requests_backfill_capacity_the_queue_does_not_need():
+    endpoints = dict(ENDPOINTS, export={'cost': 4, 'max_concurrent': 1})
+    controller = AdmissionController(capacity=10, endpoints=endpoints, queue_timeout=1)
+    release = threading.Event()
+    hold(controller, 'export', release)
+    hold(controller, 'readability', release)
+    wait_until(lambda: controller.stats()['in_use'] == 5)
+    hold(controller, 'export', release)
+    wait_until(lambda: controller.stats()['waiting'] == 1)
+
+    # 5 in use + 4 held back for the queued export leaves room for one more unit
+    with controller.admit('readability'):
+        assert controller.stats()['in_use'] == 6
+    release.set()
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    controller = AdmissionController(capacity=1, endpoints=ENDPOINTS, queue_size=0)
+    release = threading.Event()
+    hold(controller, 'readability', release)
+    wait_until(lambda: controller.stats()['in_use'] == 1)
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire('readability')
+    assert excinfo.value.status == 503
+    assert excinfo.value.retry_after >= 1
+    assert controller.stats()['rejected_queue_full'] == 1
+    release.set()
+
+
+def test_shed_requests_do_not_spend_rate_tokens():
+    controller = AdmissionController(capacity=1, endpoints=ENDPOINTS, queue_size=0, rate=0.001, burst=2)
+    release = threading.Event()
+    hold(controller, 'readability', release)
+    wait_until(lambda: controller.stats()['in_use'] == 1)
+    for _ in range(5):
+        with pytest.raises(AdmissionRejected) as excinfo:
+            controller.acquire('readability', api_key='client')
+        assert excinfo.value.status == 503
+    release.set()
+    wait_until(lambda: controller.stats()['in_use'] == 0)
+
+    with controller.admit('readability', api_key='client'):
+        pass
+    with controller.admit('readability', api_key='client'):
+        pass
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire('readability', api_key='client')
+    assert excinfo.value.status == 429
+
+
+def test_rate_limit_buckets_are_capped():
+    controller = AdmissionController(capacity=4, endpoints=ENDPOINTS, rate=1, burst=1)
+    controller.MAX_BUCKETS = 3
+    for key in ['a', 'b', 'c', 'a', 'd']:
+        try:
+            with controller.admit('readability', api_key=key):
+                pass
+        except AdmissionRejected:
+            pass
+    assert list(controller._buckets) == ['c', 'a', 'd']
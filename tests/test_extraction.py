@@ -0,0 +1,238 @@
+import os
+import time
+import zipfile
+
+import pytest
+
+import stub_backends  # noqa: F401  registers the stub backends in this process
+from extraction import BACKENDS, ExtractionError, ExtractionPool, resource
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / 'resume.txt'
+    path.write_text('Jane Doe, Python developer')
+    return str(path)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault('workers', 1)
+        kwargs.setdefault('timeout', 2)
+        kwargs.setdefault('preload', ['stub_backends'])
+        pool = ExtractionPool(**kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def wait_for_workers(pool, count, timeout=10):
+    """Replacement workers start in the background; wait until they are up."""
+    deadline = time.monotonic() + timeout
+    while pool._idle.qsize() < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_timeout_kills_worker_and_replacement_works(make_pool, document):
+    pool = make_pool(timeout=1)
+    started = time.monotonic()
+    with pytest.raises(ExtractionError) as excinfo:
+        pool.extract(document, backends=['stub_slow'])
+    assert excinfo.value.reason == 'timeout'
+    assert time.monotonic() - started < 5
+    assert pool.stats()['timeouts'] == 1
+
+    assert pool._backend_stats['stub_slow'].attempts == 1
+
+    assert pool.extract(document, backends=['stub_echo']) == 'Jane Doe, Python developer'
+    assert pool.stats()['documents'] == 1
+
+
+def test_killed_worker_charges_the_backend_it_was_stuck_in(make_pool, document):
+    pool = make_pool(timeout=1)
+    with pytest.raises(ExtractionError):
+        pool.extract(document, backends=['stub_empty', 'stub_slow'])
+    assert pool._backend_stats['stub_empty'].attempts == 1
+    assert pool._backend_stats['stub_slow'].attempts == 1
+    assert pool._backend_stats['stub_slow'].successes == 0
+
+
+def test_page_cap_is_reported_and_worker_is_reused(make_pool, document):
+    pool = make_pool(max_pages=5)
+    pid = pool.extract(document, backends=['stub_pid'])
+    with pytest.raises(ExtractionError) as excinfo:
+        pool.extract(document, backends=['stub_pages'])
+    assert excinfo.value.reason == 'pages'
+    assert pool.stats()['page_limit'] == 1
+    assert pool.extract(document, backends=['stub_pid']) == pid
+
+
+def test_crashed_worker_is_replaced(make_pool, document):
+    pool = make_pool()
+    pid = pool.extract(document, backends=['stub_pid'])
+    with pytest.raises(ExtractionError) as excinfo:
+        pool.extract(document, backends=['stub_exit'])
+    assert excinfo.value.reason == 'crash'
+    assert pool.stats()['crashes'] == 1
+
+    assert pool.extract(document, backends=['stub_pid']) != pid
+    assert pool.stats()['workers'] == 1
+
+
+@pytest.mark.skipif(resource is None, reason='address-space limits need the resource module')
+def test_memory_limit_kills_worker(make_pool, document):
+    pool = make_pool(max_address_space_mb=256)
+    with pytest.raises(ExtractionError) as excinfo:
+        pool.extract(document, backends=['stub_alloc'])
+    assert excinfo.value.reason == 'memory'
+    assert pool.stats()['memory_limit'] == 1
+    assert pool.extract(document, backends=['stub_echo']) == 'Jane Doe, Python developer'
+
+
+def test_workers_are_recycled_after_n_documents(make_pool, document):
+    pool = make_pool(max_documents_per_worker=2)
+    pids = []
+    for _ in range(5):
+        pids.append(pool.extract(document, backends=['stub_pid']))
+        wait_for_workers(pool, 1)
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert len({pids[0], pids[2], pids[4]}) == 3
+    stats = pool.stats()
+    assert stats['recycled'] == 2
+    assert stats['documents'] == 5
+    assert stats['workers'] == 1
+
+
+def test_worker_startup_is_not_charged_to_the_document(make_pool, document):
+    pool = make_pool(timeout=1, preload=['stub_backends', 'slow_preload'])
+    assert pool.extract(document, backends=['stub_echo']) == 'Jane Doe, Python developer'
+    assert pool.stats()['timeouts'] == 0
+
+
+def test_busy_pool_rejects_after_acquire_timeout(make_pool, document):
+    pool = make_pool(acquire_timeout=0.1)
+    worker = pool._acquire()
+    try:
+        with pytest.raises(ExtractionError) as excinfo:
+            pool.extract(document, backends=['stub_echo'])
+        assert excinfo.value.reason == 'busy'
+    finally:
+        pool._release(worker)
+
+
+def test_failing_backend_drops_behind_working_one(make_pool, document):
+    pool = make_pool()
+    assert pool.backend_order('ordered') == ['stub_empty', 'stub_fallback']
+    for _ in range(ExtractionPool.EXPLORATION_ATTEMPTS):
+        assert pool.extract(document, 'ordered') == 'fallback text'
+    assert pool.backend_order('ordered') == ['stub_fallback', 'stub_empty']
+
+    stats = pool.stats()['backends']
+    assert stats['stub_empty']['attempts'] == ExtractionPool.EXPLORATION_ATTEMPTS
+    assert stats['stub_empty']['successes'] == 0
+    assert stats['stub_fallback']['successes'] == ExtractionPool.EXPLORATION_ATTEMPTS
+
+
+def test_timing_out_backend_falls_back_and_drops_behind(make_pool, document):
+    pool = make_pool(timeout=1)
+    assert pool.backend_order('hanging') == ['stub_hanging', 'stub_fallback']
+    for _ in range(ExtractionPool.EXPLORATION_ATTEMPTS):
+        assert pool.extract(document, 'hanging') == 'fallback text'
+    assert pool.backend_order('hanging') == ['stub_fallback', 'stub_hanging']
+
+    stats = pool.stats()
+    assert stats['backends']['stub_hanging']['attempts'] == ExtractionPool.EXPLORATION_ATTEMPTS
+    assert stats['backends']['stub_hanging']['successes'] == 0
+    assert stats['timeouts'] == 0
+
+
+def test_document_times_out_when_every_backend_does(make_pool, document):
+    pool = make_pool(timeout=1)
+    with pytest.raises(ExtractionError) as excinfo:
+        pool.extract(document, backends=['stub_hanging'])
+    assert excinfo.value.reason == 'timeout'
+    assert str(excinfo.value) == 'Extraction timed out after 1s'
+    assert pool.stats()['timeouts'] == 1
+    assert pool._backend_stats['stub_hanging'].attempts == 1
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='needs a POSIX shell for the fake pdftotext')
+def test_timed_out_pdftotext_is_not_orphaned(make_pool, tmp_path, monkeypatch):
+    pid_file = tmp_path / 'pdftotext.pid'
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    fake = bin_dir / 'pdftotext'
+    fake.write_text(f'#!/bin/sh\necho $$ > {pid_file}\nexec sleep 30\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    pdf = tmp_path / 'resume.pdf'
+    pdf.write_bytes(b'%PDF-1.4')
+
+    pool = make_pool(timeout=1)
+    with pytest.raises(ExtractionError) as excinfo:
+        pool.extract(str(pdf), backends=['pdftotext'])
+    assert excinfo.value.reason == 'timeout'
+
+    pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while is_running(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not is_running(pid)
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='process groups are POSIX-only')
+def test_timeout_kills_children_of_the_worker(make_pool, document):
+    pool = make_pool(timeout=1)
+    with pytest.raises(ExtractionError):
+        pool.extract(document, backends=['stub_spawn'])
+
+    with open(document + '.pid') as file:
+        pid = int(file.read())
+    deadline = time.monotonic() + 5
+    while is_running(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not is_running(pid)
+
+
+def is_running(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            return stat.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+def test_docx_backend_streams_paragraphs_and_tables(tmp_path):
+    w = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    xml = (
+        f'<w:document xmlns:w="{w}"><w:body>'
+        '<w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Python</w:t><w:tab/><w:t>SQL</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:p><w:r><w:t>Senior</w:t><w:br/><w:t>Engineer</w:t></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    path = tmp_path / 'resume.docx'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', xml)
+    assert BACKENDS['docx'].extract(str(path), 0, None) == 'Jane Doe\nPython\tSQL\nSenior\nEngineer\n'
+
+
+def test_html_backend_skips_scripts_and_styles(tmp_path):
+    path = tmp_path / 'resume.html'
+    path.write_text('<html><head><style>p {}</style></head><body><h1>Jane &amp; Doe</h1>'
+                    '<script>var x = 1;</script><p>Python developer</p></body></html>')
+    text = BACKENDS['html'].extract(str(path), 0, None)
+    assert text.split() == ['Jane', '&', 'Doe', 'Python', 'developer']
@@ -0,0 +1,105 @@
+import io
+import json
+import mmap
+import struct
+
+import numpy as np
+import pytest
+
+from results import (FORMAT_VERSION, MAGIC, ResultTable, Vocabulary, synthetic_analyses)
+
+
+def edge_case_analyses():
+    """Shapes ``analyze_resume`` produces that synthetic rows never do."""
+    base = {
+        'contact_info': {'email': None, 'phone': '', 'linkedin': None, 'github': ''},
+        'skills': [],
+        'experience': [],
+        'education': [],
+        'length': 0,
+        'word_count': 0,
+        'analysis_timestamp': '2024-05-01T12:30:00'
+    }
+    readabilities = [
+        {},
+        {'grade_level': 0, 'complexity': 'Unknown'},
+        # calculate_readability clamps negative grades to the int 0
+        {'grade_level': 0, 'complexity': 'Very Easy', 'word_count': 3,
+         'sentence_count': 3, 'avg_words_per_sentence': 1.0},
+        {'grade_level': 0.0, 'complexity': 'Very Easy', 'word_count': 4,
+         'sentence_count': 2, 'avg_words_per_sentence': 2.0},
+    ]
+    return [dict(base, readability=readability) for readability in readabilities]
+
+
+@pytest.fixture
+def analyses():
+    return list(synthetic_analyses(200)) + edge_case_analyses()
+
+
+@pytest.fixture
+def table(analyses):
+    return ResultTable.from_analyses(analyses)
+
+
+def test_rows_round_trip_through_bytes(analyses, table):
+    restored = ResultTable.from_buffer(table.to_bytes())
+    assert len(restored) == len(analyses)
+    # Compare as JSON so an int 0 coming back as 0.0 is caught too
+    assert [json.dumps(row, sort_keys=True) for row in restored] == [
+        json.dumps(row, sort_keys=True) for row in analyses]
+
+
+def test_write_matches_to_bytes(table):
+    file = io.BytesIO()
+    table.write(file)
+    assert file.getvalue() == table.to_bytes()
+
+
+def test_from_buffer_over_mmap_does_not_copy(analyses, table, tmp_path):
+    path = tmp_path / 'results.rstb'
+    with open(path, 'wb') as file:
+        table.write(file)
+
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        restored = ResultTable.from_buffer(mapped)
+        for column in restored.columns.values():
+            assert not column.flags.writeable
+            assert column.base.obj is mapped
+        assert restored.to_dict(0) == analyses[0]
+        del restored, column
+        mapped.close()
+
+
+def test_columns_from_a_bytearray_are_read_only(table):
+    restored = ResultTable.from_buffer(table.to_bytes())
+    assert not restored.columns['length'].flags.writeable
+
+
+@pytest.mark.parametrize('header', [
+    struct.pack('<4sHxxI', b'NOPE', FORMAT_VERSION, 0),
+    struct.pack('<4sHxxI', MAGIC, FORMAT_VERSION + 1, 0),
+])
+def test_bad_header_is_rejected(table, header):
+    data = table.to_bytes()
+    data[:len(header)] = header
+    with pytest.raises(ValueError):
+        ResultTable.from_buffer(data)
+
+
+def test_vocabulary_is_limited_to_uint16_ids():
+    vocabulary = Vocabulary(str(i) for i in range(65536))
+    assert vocabulary.intern('65535') == 65535
+    with pytest.raises(ValueError, match='65536'):
+        vocabulary.intern('one too many')
+
+
+def test_shared_vocabularies_are_used_for_both_id_columns(analyses):
+    skills = Vocabulary(['cobol'])
+    education = Vocabulary(['Diploma'])
+    table = ResultTable.from_analyses(analyses[:10], skills=skills, education=education)
+    assert table.skills[0] == 'cobol'
+    assert table.education[0] == 'Diploma'
+    assert table.education == education.words
+    assert np.all(table.columns['education_ids'] > 0)